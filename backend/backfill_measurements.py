@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Script de remplissage des colonnes numériques des mesures
+Recalcule <mesure>_min / <mesure>_max à partir du texte ("90-95") pour les
+mesures existantes. Peut être relancé sans risque.
+
+Les mesures modifiées reçoivent un nouvel updated_at : les workers en cours
+d'exécution (index de similarité, cache des réponses) et les synchronisations
+différentielles voient ainsi les nouvelles valeurs. --keep-updated-at conserve
+les dates d'origine (base hors ligne, aucun worker à prévenir).
+
+Usage: python backfill_measurements.py [taille_de_lot] [--keep-updated-at]
+"""
+import sys
+from datetime import datetime
+from sqlalchemy import select, update
+from app import app, db, Measurement, BODY_DIMENSIONS, numeric_dimensions
+
+def backfill(batch_size=1000, keep_updated_at=False):
+    """Walk measurements by id in batches and bulk-update the numeric columns"""
+    columns = [Measurement.id, Measurement.updated_at] + [getattr(Measurement, d) for d in BODY_DIMENSIONS]
+    last_id, total = 0, 0
+    with app.app_context():
+        while True:
+            rows = db.session.execute(
+                select(*columns).where(Measurement.id > last_id).order_by(Measurement.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            # A new updated_at is what tells running workers and delta syncs the rows changed
+            db.session.execute(update(Measurement), [
+                {'id': row.id, 'updated_at': row.updated_at if keep_updated_at else datetime.utcnow(),
+                 **numeric_dimensions(row._asdict())}
+                for row in rows
+            ])
+            db.session.commit()
+            last_id = rows[-1].id
+            total += len(rows)
+            print(f"  {total} measurements updated...")
+    print(f"✅ Backfill completed: {total} measurements")
+    return total
+
+if __name__ == '__main__':
+    print("🔧 Backfilling numeric measurement columns...")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    backfill(int(args[0]) if args else 1000, keep_updated_at='--keep-updated-at' in sys.argv)
+    sys.exit(0)
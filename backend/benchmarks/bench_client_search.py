@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark de la recherche de clients (index de trigrammes en mémoire)
+
+Remplit un ClientSearchIndex avec des clients synthétiques au vocabulaire
+réaliste : quelques noms très courants, puis une longue traîne de noms et
+prénoms construits à partir de syllabes (des dizaines de milliers de mots
+distincts). Les recherches sont tirées des noms générés : nom exact, début de
+nom, faute de frappe, nom + prénom, morceau de numéro. Un second index aux noms
+numérotés ("Nom123", "Pre45") reproduit le pire cas : des trigrammes partagés
+par presque tout le vocabulaire.
+
+Usage: python benchmarks/bench_client_search.py [nombre_de_clients]
+"""
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from client_search import ClientSearchIndex, normalize
+
+NOMS_COURANTS = [
+    'Kouassi', 'Koffi', 'Konan', 'Kouamé', 'Yao', 'Ouattara', 'Traoré', 'Coulibaly', 'Koné', 'Diabaté',
+    'Bamba', 'Touré', 'Cissé', 'Diallo', 'Dupont', 'Durand', 'Martin', 'Bernard', 'Lefèvre', 'Moreau',
+]
+PRENOMS_COURANTS = [
+    'Éloïse', 'Aïcha', 'Awa', 'Mariam', 'Fatou', 'Adjoua', 'Amenan', 'Akissi', 'Jean-Marc', 'Hélène',
+]
+SYLLABES = [
+    'ko', 'ua', 'ssi', 'ya', 'o', 'ta', 'ra', 'ba', 'mba', 'di', 'a', 'ne', 'gue', 'ssan', 'bro', 'za',
+    'se', 'ri', 'ha', 'tou', 'lo', 'mi', 'fa', 'dja', 'ke', 'nou', 'pe', 'gna', 'sou', 'vi', 'le', 'ma',
+    'dou', 'kan', 'bi', 'to', 'che', 'ran', 'el', 'ju',
+]
+REPEAT = 20
+
+def invented_name(rng, syllables):
+    return ''.join(rng.choices(SYLLABES, k=syllables)).title()
+
+def realistic_clients(n_clients, rng):
+    """(nom, prenoms) pairs: one in four from the common names, the rest from a long tail"""
+    noms = list(dict.fromkeys(invented_name(rng, rng.randint(2, 4)) for _ in range(n_clients // 2)))
+    prenoms = list(dict.fromkeys(invented_name(rng, rng.randint(2, 3)) for _ in range(n_clients // 20)))
+    for id in range(n_clients):
+        if id % 4 == 0:
+            yield rng.choice(NOMS_COURANTS), rng.choice(PRENOMS_COURANTS)
+        else:
+            # Smaller indices come up more often, like real surname frequencies
+            yield noms[int(len(noms) * rng.random() ** 2)], prenoms[int(len(prenoms) * rng.random() ** 2)]
+
+def typo(word, rng):
+    position = rng.randrange(1, len(word))
+    return word[:position] + rng.choice('aeiou') + word[position + 1:]
+
+def realistic_queries(people, rng):
+    nom, prenoms = (normalize(text) for text in rng.choice(people))
+    # Clients whose id is not a multiple of 4 have long-tail names
+    rare_nom = normalize(rng.choice([nom for nom, _ in people[1::4]]))
+    return [
+        ('nom exact', nom),
+        ('nom rare', rare_nom),
+        ('début de nom', nom[:4]),
+        ('faute de frappe', typo(rare_nom, rng)),
+        ('nom + prénom', f'{nom} {prenoms}'),
+        ('morceau de numéro', f'{rng.randint(0, 9999):04d}'),
+    ]
+
+def fill(index, people, rng):
+    start = time.perf_counter()
+    for id, (nom, prenoms) in enumerate(people, 1):
+        index.upsert(id, nom, prenoms, None, f'07 {rng.randint(0, 99999999):08d}')
+    print(f"Indexed {len(people)} clients in {time.perf_counter() - start:.1f} s, "
+          f"{len(index.word_clients)} distinct words")
+
+def run(index, queries):
+    for label, query in queries:
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            results = index.search(query, 20)
+        elapsed = (time.perf_counter() - start) / REPEAT * 1000
+        print(f"- {label} ({query!r}): {elapsed:.2f} ms, {len(results)} results")
+
+if __name__ == '__main__':
+    n_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+
+    print("Vocabulaire réaliste")
+    people = list(realistic_clients(n_clients, rng))
+    index = ClientSearchIndex()
+    fill(index, people, rng)
+    run(index, realistic_queries(people, rng) + realistic_queries(people, rng))
+
+    print("Noms numérotés")
+    index = ClientSearchIndex()
+    fill(index, [(f'Nom{id}', f'Pre{id % 1000}') for id in range(1, n_clients + 1)], rng)
+    run(index, [('nom numéroté', 'nom5'), ('prénom numéroté', 'pre99'), ('nom + prénom', 'nom5 pre5'),
+                ('nom complet', f'nom{n_clients // 3}')])
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Benchmark des requêtes critiques avant / après les index de la migration 0001
+
+Crée une base SQLite temporaire (ou utilise BENCH_DATABASE_URL, jamais la base
+de production), la remplit, supprime les index puis affiche le plan
+d'exécution et la durée de chaque requête, avant et après la migration.
+
+Usage: python benchmarks/bench_query_plans.py [nombre_de_clients]
+"""
+import os
+import sys
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = tempfile.mkdtemp(prefix='kis-bench-')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL', f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}")
+os.environ.setdefault('UPLOAD_FOLDER', BENCH_DIR)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, func, insert
+from app import app, db, init_database_tables, Client, Measurement, Order
+from migrations import migration_0001_hot_query_indexes
+
+INDEXES = [
+    'ix_client_created_at_id', 'ix_client_updated_at',
+    'ix_measurement_client_id_created_at', 'ix_measurement_updated_at', 'ix_measurement_image_path',
+    'ix_order_status_created_at', 'ix_order_client_id', 'ix_order_updated_at',
+]
+REPEAT = 20
+
+def seed(n_clients):
+    start = datetime(2024, 1, 1)
+    clients = [
+        {'nom': f'Nom{i}', 'prenoms': 'Prenoms', 'telephone': f'07{i:08d}',
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(n_clients)
+    ]
+    db.session.execute(insert(Client), clients)
+    measurements = [
+        {'client_id': random.randint(1, n_clients), 'poitrine': '90-95',
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(n_clients * 3)
+    ]
+    db.session.execute(insert(Measurement), measurements)
+    orders = [
+        {'client_id': random.randint(1, n_clients), 'montant_total': 100.0, 'montant_avance': 20.0,
+         'montant_restant': 80.0, 'status': random.choice(['en_cours', 'termine']),
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(n_clients * 5)
+    ]
+    db.session.execute(insert(Order), orders)
+    db.session.commit()
+
+def hot_queries(n_clients):
+    client_id = n_clients // 2
+    return [
+        ('measurements of a client',
+         select(Measurement).where(Measurement.client_id == client_id).order_by(Measurement.created_at.desc())),
+        ('orders by status',
+         select(Order).where(Order.status == 'en_cours').order_by(Order.created_at.desc()).limit(50)),
+        ('clients page',
+         select(Client).order_by(Client.created_at.desc(), Client.id.desc()).limit(50)),
+        ('max(client.updated_at)', select(func.max(Client.updated_at))),
+        ('max(measurement.updated_at)', select(func.max(Measurement.updated_at))),
+        ('max(order.updated_at)', select(func.max(Order.updated_at))),
+    ]
+
+def explain(conn, statement):
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+    return [' '.join(str(col) for col in row) for row in conn.exec_driver_sql(prefix + sql)]
+
+def measure(conn, statement):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        conn.execute(statement).fetchall()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+def report(label, n_clients):
+    print(f"\n=== {label} ===")
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('ANALYZE')
+        for name, statement in hot_queries(n_clients):
+            elapsed = measure(conn, statement)
+            print(f"- {name}: {elapsed:.2f} ms")
+            for line in explain(conn, statement):
+                print(f"    {line}")
+
+if __name__ == '__main__':
+    n_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with app.app_context():
+        init_database_tables()
+        with db.engine.begin() as conn:
+            for name in INDEXES:
+                conn.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
+        print(f"Seeding {n_clients} clients, {n_clients * 3} measurements, {n_clients * 5} orders...")
+        seed(n_clients)
+
+        report('Before (no secondary indexes)', n_clients)
+        with db.engine.begin() as conn:
+            migration_0001_hot_query_indexes(conn, db.metadata)
+        report('After migration 0001', n_clients)
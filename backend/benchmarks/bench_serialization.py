@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark de la sérialisation des listes
+
+Compare, pour chaque modèle, le chemin historique (objets ORM + to_dict() +
+json) au chemin rapide des endpoints de liste (tuples de colonnes +
+row_serializer), avec l'encodeur json standard et avec orjson s'il est
+installé. Affiche le nombre de lignes sérialisées par seconde.
+
+Vérifie aussi que les deux chemins produisent exactement les mêmes objets :
+le script échoue si les listes *_COLUMNS de app.py divergent de to_dict().
+
+Usage: python benchmarks/bench_serialization.py [nombre_de_lignes]
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = tempfile.mkdtemp(prefix='kis-bench-')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL', f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}")
+os.environ.setdefault('UPLOAD_FOLDER', BENCH_DIR)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+from app import (
+    app, db, init_database_tables, Client, Measurement, Order,
+    CLIENT_COLUMNS, MEASUREMENT_COLUMNS, ORDER_COLUMNS,
+    serialize_client, serialize_measurement, serialize_order
+)
+from serializers import orjson
+
+REPEAT = 3
+
+def seed(n_rows):
+    start = datetime(2024, 1, 1)
+    n_clients = max(1, n_rows // 5)
+    db.session.execute(insert(Client), [
+        {'nom': f'Nom{i}', 'prenoms': 'Prénoms', 'telephone': f'07{i:08d}', 'email': f'c{i}@example.com',
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(n_clients)
+    ])
+    db.session.execute(insert(Measurement), [
+        {'client_id': random.randint(1, n_clients), 'poitrine': '90-95', 'taille': '70', 'bassin': '100',
+         'manche': '60', 'description': 'Robe de soirée', 'image_path': None,
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(n_rows)
+    ])
+    db.session.execute(insert(Order), [
+        {'client_id': random.randint(1, n_clients), 'montant_total': 100.0, 'montant_avance': 20.0,
+         'montant_restant': 80.0, 'status': random.choice(['en_cours', 'termine']),
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i),
+         'completed_at': None if i % 2 else start + timedelta(days=1, minutes=i)}
+        for i in range(n_rows)
+    ])
+    db.session.commit()
+
+def cases():
+    """(model, ORM path, fast path), each returning the list of dicts"""
+    return [
+        ('client',
+         lambda: [c.to_dict() for c in Client.query.order_by(Client.id)],
+         lambda: [serialize_client(r) for r in Client.query.order_by(Client.id).with_entities(*CLIENT_COLUMNS)]),
+        ('measurement',
+         lambda: [m.to_dict() for m in Measurement.query.order_by(Measurement.id)],
+         lambda: [serialize_measurement(r) for r in
+                  Measurement.query.order_by(Measurement.id).with_entities(*MEASUREMENT_COLUMNS)]),
+        ('order',
+         lambda: [o.to_dict() for o in Order.query.options(joinedload(Order.client)).order_by(Order.id)],
+         lambda: [serialize_order(r) for r in Order.query.outerjoin(Order.client).order_by(Order.id)
+                  .with_entities(*ORDER_COLUMNS, *CLIENT_COLUMNS)]),
+    ]
+
+def rows_per_second(build, dumps):
+    best = None
+    for _ in range(REPEAT):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        items = build()
+        dumps(items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(items) / best
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    stdlib_dumps = lambda items: json.dumps(items, sort_keys=True)
+    encoders = [('json', stdlib_dumps)]
+    if orjson is not None:
+        encoders.append(('orjson', lambda items: orjson.dumps(items, option=orjson.OPT_SORT_KEYS)))
+
+    with app.app_context():
+        init_database_tables()
+        print(f"Seeding {n_rows} measurements and orders, {max(1, n_rows // 5)} clients...")
+        seed(n_rows)
+
+        for model, orm_path, fast_path in cases():
+            if orm_path() != fast_path():
+                print(f"❌ {model}: column path differs from to_dict()")
+                sys.exit(1)
+            print(f"\n=== {model} ===")
+            baseline = rows_per_second(orm_path, stdlib_dumps)
+            print(f"- ORM + to_dict() + json: {baseline:,.0f} rows/s")
+            for name, dumps in encoders:
+                rate = rows_per_second(fast_path, dumps)
+                print(f"- columns + row_serializer + {name}: {rate:,.0f} rows/s ({rate / baseline:.1f}x)")
+    if orjson is None:
+        print("\norjson is not installed: the encoder comparison was skipped")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Benchmark de la recherche de morphologies proches
+
+Compare MeasurementIndex.nearest (NumPy) à une boucle Python naïve qui calcule
+la même distance mesure par mesure, sur des données synthétiques.
+
+Usage: python benchmarks/bench_similarity.py [nombre_de_mesures]
+"""
+import os
+import sys
+import math
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from similarity import MeasurementIndex, MIN_SHARED_DIMENSIONS
+
+DIMENSIONS = 13
+QUERIES = 20
+K = 10
+
+def naive_nearest(rows, vector, k, exclude_client_id):
+    """Same distance as MeasurementIndex.nearest, one measurement at a time"""
+    known = sum(1 for v in vector if not math.isnan(v))
+    scored = []
+    for id, client_id, values in rows:
+        if client_id == exclude_client_id:
+            continue
+        shared, squared = 0, 0.0
+        for a, b in zip(values, vector):
+            if not (math.isnan(a) or math.isnan(b)):
+                shared += 1
+                squared += (a - b) ** 2
+        if shared >= min(MIN_SHARED_DIMENSIONS, known):
+            scored.append((math.sqrt(squared / max(shared, 1)), id))
+    scored.sort()
+    return [(id, distance) for distance, id in scored[:k]]
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = np.random.default_rng(42)
+    vectors = rng.normal(80, 15, size=(n, DIMENSIONS)).astype(np.float32)
+    # Roughly a third of the dimensions are left empty, like real measurement sheets
+    vectors[rng.random(vectors.shape) < 0.3] = np.nan
+    client_ids = rng.integers(1, n // 3 + 2, size=n)
+
+    start = time.perf_counter()
+    index = MeasurementIndex([f'd{i}' for i in range(DIMENSIONS)])
+    for i in range(n):
+        index.upsert(i + 1, int(client_ids[i]), vectors[i])
+    print(f"Index build ({n} measurements): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rows = [(i + 1, int(client_ids[i]), vectors[i].tolist()) for i in range(n)]
+    queries = rng.integers(0, n, size=QUERIES)
+
+    start = time.perf_counter()
+    for q in queries:
+        fast = index.nearest(vectors[q], K, exclude_client_id=int(client_ids[q]))
+    numpy_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+    start = time.perf_counter()
+    for q in queries[:3]:
+        slow = naive_nearest(rows, vectors[q].tolist(), K, int(client_ids[q]))
+    naive_ms = (time.perf_counter() - start) / 3 * 1000
+
+    # float32 rounding may swap exact ties, so compare distances rather than ids
+    q = queries[2]
+    fast = index.nearest(vectors[q], K, exclude_client_id=int(client_ids[q]))
+    slow = naive_nearest(rows, vectors[q].tolist(), K, int(client_ids[q]))
+    same = all(abs(a[1] - b[1]) < 0.05 for a, b in zip(fast, slow)) and len(fast) == len(slow)
+    print(f"NumPy index: {numpy_ms:.1f} ms/query")
+    print(f"Naive loop:  {naive_ms:.1f} ms/query ({naive_ms / numpy_ms:.0f}x slower)")
+    print(f"Same neighbour distances: {same}")
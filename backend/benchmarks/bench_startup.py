@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Benchmark du démarrage de l'application
+
+Mesure, dans un processus neuf à chaque essai, le temps de `import app` (qui
+appelle create_app()) et vérifie qu'aucune connexion à la base n'est ouverte :
+la base pointe vers un chemin SQLite inaccessible, donc la moindre connexion
+au démarrage ferait échouer l'import.
+
+Sort avec un code non nul si la médiane dépasse le budget, pour servir de
+garde-fou en CI.
+
+Usage: python benchmarks/bench_startup.py [budget_ms] [essais]
+"""
+import os
+import sys
+import json
+import statistics
+import subprocess
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+}))
+"""
+
+def run_probe(upload_folder):
+    env = dict(
+        os.environ,
+        # Any connection attempt at import time fails loudly on this path
+        DATABASE_URL='sqlite:////nonexistent-dir/startup-guard.db',
+        UPLOAD_FOLDER=upload_folder,
+        RENDER='',
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+if __name__ == '__main__':
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as upload_folder:
+        samples = [run_probe(upload_folder) for _ in range(runs)]
+
+    import_ms = statistics.median(s['import_ms'] for s in samples)
+    create_ms = statistics.median(s['create_app_ms'] for s in samples)
+    print(f"import app (includes create_app): {import_ms:.1f} ms (median of {runs})")
+    print(f"create_app() alone: {create_ms:.1f} ms")
+
+    if import_ms > budget_ms:
+        print(f"❌ Startup budget exceeded: {import_ms:.1f} ms > {budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"✅ Within budget ({budget_ms:.0f} ms)")
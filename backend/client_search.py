@@ -0,0 +1,225 @@
+"""
+Recherche de clients par nom, prénoms, email ou téléphone
+
+Les textes sont normalisés (minuscules, sans accents ni ponctuation) pour que
+"Éloïse" se trouve en tapant "eloise". Sur PostgreSQL la recherche passe par
+l'extension pg_trgm sur les colonnes client.search_text / client.phone_digits ;
+ailleurs (SQLite, tests) par ClientSearchIndex, un index de trigrammes en
+mémoire qui tolère les fautes de frappe de la même façon.
+"""
+import bisect
+import heapq
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# Minimum trigram similarity (as pg_trgm's) for a word to match a query word
+MIN_WORD_SIMILARITY = 0.3
+# Query words are matched as prefixes too ("dup" finds "dupont") with this score
+PREFIX_SCORE = 0.9
+# Shorter digit strings would match most phone numbers
+MIN_PHONE_DIGITS = 3
+# Words scored per query word at most: a trigram shared by most of the
+# vocabulary ("nom", " no") would otherwise mean comparing against all of it
+MAX_CANDIDATE_WORDS = 2000
+
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+NON_DIGIT = re.compile(r'\D+')
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation: 'Kouassi-Éloïse' -> 'kouassi eloise'"""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return NON_ALNUM.sub(' ', stripped.lower()).strip()
+
+def search_text(nom, prenoms, email):
+    """Value of client.search_text: the normalized words the search matches"""
+    # Only the local part of the email: every client would match 'gmail' or 'com'
+    local_part = (email or '').split('@')[0]
+    return ' '.join(filter(None, (normalize(nom), normalize(prenoms), normalize(local_part))))
+
+def phone_digits(telephone):
+    """Value of client.phone_digits: '07 08-09.10' -> '07080910'"""
+    return NON_DIGIT.sub('', telephone or '')
+
+def trigrams(word):
+    """pg_trgm style trigrams, padded so short words and word starts count"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def parse_query(query):
+    """(words, digits): name words to match, and the digits of a phone number if any"""
+    words = normalize(query).split()
+    digits = ''.join(w for w in words if w.isdigit())
+    words = [w for w in words if not w.isdigit()]
+    return words, digits if len(digits) >= MIN_PHONE_DIGITS else ''
+
+class ClientSearchIndex:
+    """
+    Inverted trigram index over the distinct words of client names and emails.
+
+    Names repeat a lot, so the trigrams index words, not clients: a query word
+    is compared to the words sharing its rarest trigrams (at most
+    MAX_CANDIDATE_WORDS, completed by the words it prefixes), and each matching
+    word maps to its clients. Phone numbers are kept in one string scanned with
+    str.find; it and the sorted vocabulary are rebuilt lazily after changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.client_words = {}      # client id -> words
+        self.word_clients = {}      # word -> client ids
+        self.trigram_words = {}     # trigram -> words
+        self.word_trigram_count = {}
+        self.phones = {}            # client id -> digits
+        self.phone_blob = None      # ('\n'-joined digits, start offsets, client ids)
+        self.sorted_words = None    # vocabulary in order, for prefix lookups
+
+    def __len__(self):
+        return len(self.client_words)
+
+    def _add_word(self, word, id):
+        clients = self.word_clients.get(word)
+        if clients is None:
+            clients = self.word_clients[word] = set()
+            grams = trigrams(word)
+            self.word_trigram_count[word] = len(grams)
+            for gram in grams:
+                self.trigram_words.setdefault(gram, set()).add(word)
+            self.sorted_words = None
+        clients.add(id)
+
+    def _remove_word(self, word, id):
+        clients = self.word_clients[word]
+        clients.discard(id)
+        if clients:
+            return
+        del self.word_clients[word]
+        del self.word_trigram_count[word]
+        self.sorted_words = None
+        for gram in trigrams(word):
+            words = self.trigram_words[gram]
+            words.discard(word)
+            if not words:
+                del self.trigram_words[gram]
+
+    def _remove(self, id):
+        for word in self.client_words.pop(id, ()):
+            self._remove_word(word, id)
+        if self.phones.pop(id, None) is not None:
+            self.phone_blob = None
+
+    def upsert(self, id, nom, prenoms, email, telephone):
+        words = set(search_text(nom, prenoms, email).split())
+        digits = phone_digits(telephone)
+        with self.lock:
+            self._remove(id)
+            self.client_words[id] = words
+            for word in words:
+                self._add_word(word, id)
+            if digits:
+                self.phones[id] = digits
+                self.phone_blob = None
+
+    def remove(self, id):
+        with self.lock:
+            self._remove(id)
+
+    def _prefixed_words(self, prefix, limit):
+        """Up to limit indexed words starting with prefix, in order"""
+        if self.sorted_words is None:
+            self.sorted_words = sorted(self.word_clients)
+        start = bisect.bisect_left(self.sorted_words, prefix)
+        words = []
+        for word in self.sorted_words[start:start + limit]:
+            if not word.startswith(prefix):
+                break
+            words.append(word)
+        return words
+
+    def _matching_words(self, query_word):
+        """{word: score} of the indexed words similar to query_word"""
+        grams = trigrams(query_word)
+        # Rarest trigrams first: they bring the likeliest candidates for the fewest words
+        postings = sorted((self.trigram_words.get(gram, ()) for gram in grams), key=len)
+        shared = Counter()
+        for i, words in enumerate(postings):
+            if len(shared) + len(words) > MAX_CANDIDATE_WORDS:
+                break
+            shared.update(words)
+        else:
+            i = len(postings)
+        if i < len(postings):
+            # Too common to take whole: complete with the words query_word prefixes,
+            # then only count the remaining trigrams for the candidates already found
+            for word in self._prefixed_words(query_word, MAX_CANDIDATE_WORDS - len(shared)):
+                shared.setdefault(word, 0)
+            for words in postings[i:]:
+                for word in shared:
+                    if word in words:
+                        shared[word] += 1
+        matches = {}
+        for word, count in shared.items():
+            # Jaccard similarity of the trigram sets, like pg_trgm's similarity()
+            score = count / (len(grams) + self.word_trigram_count[word] - count)
+            if word.startswith(query_word):
+                score = max(score, PREFIX_SCORE if word != query_word else 1.0)
+            if score >= MIN_WORD_SIMILARITY:
+                matches[word] = score
+        return matches
+
+    def _best_of_word(self, matches, limit, allowed=None):
+        """Top clients for one query word: walk its words best first, stop once limit is reached"""
+        best = {}
+        for word, score in sorted(matches.items(), key=lambda item: -item[1]):
+            if len(best) >= limit and score < last_score:
+                break
+            clients = self.word_clients[word] if allowed is None else self.word_clients[word] & allowed
+            # A client with several matching words keeps the score of its best one
+            for id in sorted(clients):
+                best.setdefault(id, score)
+            last_score = score
+        return best
+
+    def _phone_matches(self, digits):
+        if self.phone_blob is None:
+            ids = list(self.phones)
+            offsets, position = [], 0
+            for id in ids:
+                offsets.append(position)
+                position += len(self.phones[id]) + 1
+            self.phone_blob = ('\n'.join(self.phones[id] for id in ids), offsets, ids)
+        blob, offsets, ids = self.phone_blob
+        matches = set()
+        start = blob.find(digits)
+        while start != -1:
+            matches.add(ids[bisect.bisect_right(offsets, start) - 1])
+            start = blob.find(digits, start + 1)
+        return matches
+
+    def search(self, query, limit=20):
+        """Best matches as [(client id, score)], score in [0, 1], best first"""
+        words, digits = parse_query(query)
+        if not words and not digits:
+            return []
+        with self.lock:
+            phone_matches = self._phone_matches(digits) if digits else None
+            if not words:
+                scores = dict.fromkeys(phone_matches, 1.0)
+            elif len(words) == 1:
+                scores = self._best_of_word(self._matching_words(words[0]), limit, phone_matches)
+            else:
+                # Every query word must match one of the client's words: intersect, then score the few left
+                matches = [self._matching_words(word) for word in words]
+                candidates = phone_matches
+                for word_matches in matches:
+                    clients = set().union(*(self.word_clients[w] for w in word_matches))
+                    candidates = clients if candidates is None else candidates & clients
+                scores = {
+                    id: sum(max(m.get(w, 0) for w in self.client_words[id]) for m in matches) / len(words)
+                    for id in candidates
+                }
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
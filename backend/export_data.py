@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Script de sauvegarde des données de l'atelier
+
+Écrit dans un fichier zip les clients, mesures et commandes (NDJSON ou CSV)
+ainsi que les images référencées du dossier d'uploads, comme GET /api/export.
+Avec --updated-since, seules les lignes modifiées depuis cette date sont
+exportées, plus la liste des lignes supprimées (sauvegarde incrémentale).
+
+Usage: python export_data.py fichier.zip [--format ndjson|csv] [--updated-since 2025-01-31T00:00:00] [--no-files]
+"""
+import sys
+import time
+from datetime import datetime
+from app import app, export_archive, EXPORT_FORMATS
+
+def export_to_file(path, format='ndjson', updated_since=None, include_files=True):
+    """Write the archive to path chunk by chunk; returns its size in bytes"""
+    start = time.perf_counter()
+    size = 0
+    with app.app_context(), open(path, 'wb') as output:
+        for chunk in export_archive(format, updated_since, include_files):
+            output.write(chunk)
+            size += len(chunk)
+    print(f"✅ {size / 1024 / 1024:.1f} MB written to {path} in {time.perf_counter() - start:.1f} s")
+    return size
+
+def option(args, name):
+    """Remove `name value` from args and return value, or None"""
+    if name not in args:
+        return None
+    position = args.index(name)
+    value = args[position + 1]
+    del args[position:position + 2]
+    return value
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    format = option(args, '--format') or 'ndjson'
+    updated_since = option(args, '--updated-since')
+    include_files = '--no-files' not in args
+    args = [arg for arg in args if arg != '--no-files']
+    if len(args) != 1 or format not in EXPORT_FORMATS:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+
+    print(f"💾 Exporting {'changes since ' + updated_since if updated_since else 'all data'} to {args[0]}...")
+    export_to_file(args[0], format, datetime.fromisoformat(updated_since) if updated_since else None, include_files)
+    sys.exit(0)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Script de nettoyage du dossier d'uploads
+Supprime les images qui ne sont plus référencées par aucune mesure
+"""
+import os
+import re
+import sys
+import time
+from app import app, db, Measurement, remove_idle_upload
+
+# Cached variants are named <original stem>.w<width>.<ext>
+VARIANT_PATTERN = re.compile(r'^(?P<stem>.+)\.w\d+\.\w+$')
+# In-flight sync uploads are left alone until they are clearly abandoned
+TEMP_FILE_MAX_AGE = 3600
+
+def collect_garbage(dry_run=False):
+    """Remove unreferenced uploads, their variants and stale temp files"""
+    upload_folder = app.config['UPLOAD_FOLDER']
+    with app.app_context():
+        referenced = {
+            row[0] for row in db.session.query(Measurement.image_path)
+            .filter(Measurement.image_path.isnot(None)).distinct()
+        }
+    referenced_stems = {os.path.splitext(name)[0] for name in referenced}
+
+    removed, freed = 0, 0
+    now = time.time()
+    for entry in list(os.scandir(upload_folder)):
+        if not entry.is_file() or entry.name == '.gitkeep':
+            continue
+        original = False
+        if entry.name.startswith('.tmp-'):
+            keep = now - entry.stat().st_mtime < TEMP_FILE_MAX_AGE
+        else:
+            match = VARIANT_PATTERN.match(entry.name)
+            if match:
+                keep = match.group('stem') in referenced_stems
+            else:
+                original = True
+                keep = entry.name in referenced
+        if keep:
+            continue
+
+        if original:
+            # Originals get the reuse grace period and take their variants along
+            size = remove_idle_upload(upload_folder, entry.name, dry_run=dry_run)
+            if size is None:
+                continue
+        else:
+            try:
+                size = entry.stat().st_size
+                if not dry_run:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+        print(f"{'Would remove' if dry_run else 'Removing'} {entry.name} ({size} bytes)")
+        removed += 1
+        freed += size
+
+    print(f"✅ {removed} unreferenced file(s), {freed / 1024 / 1024:.1f} MB {'reclaimable' if dry_run else 'freed'}")
+    return removed
+
+if __name__ == '__main__':
+    print("🔧 Collecting unreferenced uploads...")
+    collect_garbage(dry_run='--dry-run' in sys.argv)
+    sys.exit(0)
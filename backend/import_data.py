@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Script d'import en masse de clients, mesures ou commandes
+
+Lit un fichier CSV (avec ligne d'en-tête) ou NDJSON (un objet JSON par ligne)
+et l'insère par lots, comme POST /api/import/<type>. Les clients peuvent avoir
+une colonne client_ref (identifiant dans l'ancien système) que les mesures et
+les commandes utilisent pour désigner leur client ; sinon client_id.
+Importer les clients d'abord, puis les mesures et les commandes.
+
+Usage: python import_data.py clients|measurements|orders fichier.csv|fichier.ndjson [--batch-size N]
+"""
+import sys
+import time
+from app import app, import_records, read_import_records, IMPORT_BATCH_SIZE, IMPORT_KINDS
+
+def import_file(kind, path, batch_size=IMPORT_BATCH_SIZE):
+    """Import one file, printing progress after every batch; returns the final report"""
+    format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    start = time.perf_counter()
+    with app.app_context(), open(path, 'rb') as stream:
+        for report in import_records(kind, read_import_records(stream, format), batch_size):
+            rate = report['processed'] / max(time.perf_counter() - start, 1e-6)
+            print(f"... {report['processed']} rows read, {report['imported']} imported, "
+                  f"{report['skipped']} skipped, {report['failed']} failed ({rate:,.0f} rows/s)")
+    for error in report['errors']:
+        print(f"Line {error['line']}: {error['error']}")
+    if report['failed'] > len(report['errors']):
+        print(f"... and {report['failed'] - len(report['errors'])} more errors")
+    return report
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    batch_size = IMPORT_BATCH_SIZE
+    if '--batch-size' in args:
+        position = args.index('--batch-size')
+        batch_size = int(args[position + 1])
+        del args[position:position + 2]
+    if len(args) != 2 or args[0] not in IMPORT_KINDS:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+
+    print(f"📥 Importing {args[0]} from {args[1]}...")
+    report = import_file(args[0], args[1], batch_size)
+    print(f"{'✅' if not report['failed'] else '⚠️ '} {report['imported']} {args[0]} imported, "
+          f"{report['skipped']} skipped, {report['failed']} failed")
+    sys.exit(1 if report['failed'] else 0)
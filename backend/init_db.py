@@ -13,35 +13,32 @@ def init_db():
     max_retries = 15
     retry_delay = 5
     
-    # Print environment variables for debugging
-    print("Environment variables in init_db:")
-    for key, value in sorted(os.environ.items()):
-        if 'DATABASE' in key.upper() or 'POSTGRES' in key.upper():
-            print(f"  {key}: {value}")
-    
     # Check if we have a database URL
     db_url = os.getenv('DATABASE_URL')
     if not db_url:
         print("❌ No DATABASE_URL found - cannot initialize database!")
         return False
     
-    print(f"Using database URL: {db_url}")
-    
     for attempt in range(max_retries):
         try:
             with app.app_context():
                 print(f"🔧 Attempt {attempt + 1} to create database tables...")
                 # Print database URI for debugging
-                print(f"Database URI: {app.config['SQLALCHEMY_DATABASE_URI']}")
+                print(f"Database URI: {db.engine.url.render_as_string(hide_password=True)}")
                 
                 # Test database connection first
                 print("Testing database connection...")
-                db.engine.connect()
+                with db.engine.connect():
+                    pass
                 print("✅ Database connection successful!")
                 
                 # Create all tables (this won't drop existing tables or data)
                 db.create_all()
                 print("✅ Database tables created successfully!")
+
+                # Bring existing tables up to date (new columns, indexes)
+                from migrations import run_migrations
+                run_migrations(db.engine, db.metadata)
                 
                 # Verify tables exist
                 from sqlalchemy import inspect
@@ -68,13 +65,8 @@ def init_db():
 
 if __name__ == '__main__':
     # Always initialize the database (SQLAlchemy handles existing tables properly)
+    # No upfront sleep: the retry loop already waits for the database when it is not ready yet
     print("🔧 Initializing database...")
-    print(f"Database URL: {os.getenv('DATABASE_URL', 'Not set')}")
-    
-    # Add a delay to ensure database is ready
-    print("Waiting for database to be ready...")
-    time.sleep(5)
-    
     success = init_db()
     if success:
         print("✅ Database initialization completed successfully!")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+"""
+Migrations du schéma de la base de données
+
+db.create_all() crée les tables manquantes mais ne modifie jamais une table
+existante (nouvelles colonnes, nouveaux index). Chaque migration ci-dessous est
+appliquée une seule fois et enregistrée dans la table schema_migrations.
+Les modèles de app.py restent la référence : une base neuve obtient le même
+schéma via create_all(), et les migrations sont alors sans effet.
+"""
+import re
+import sys
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, MetaData, String, Table, bindparam, func, inspect, select
+
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', String(100), primary_key=True),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+def create_index(conn, table, name):
+    """Create an index declared on a model's table if the database does not have it yet"""
+    index = next(i for i in table.indexes if i.name == name)
+    existing = {i['name'] for i in inspect(conn).get_indexes(table.name)}
+    if name not in existing:
+        index.create(conn)
+
+def add_column(conn, table, name):
+    """Add a column declared on a model's table to the existing database table"""
+    column = table.columns[name]
+    existing = {c['name'] for c in inspect(conn).get_columns(table.name)}
+    if name in existing:
+        return
+    preparer = conn.dialect.identifier_preparer
+    column_type = column.type.compile(dialect=conn.dialect)
+    conn.exec_driver_sql(
+        f"ALTER TABLE {preparer.format_table(table)} "
+        f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+    )
+
+# Migrations receive the connection and the models' MetaData (db.metadata)
+def migration_0001_hot_query_indexes(conn, metadata):
+    """Indexes for the list endpoints, the sync delta queries and image refcounts"""
+    client, measurement, order = (metadata.tables[name] for name in ('client', 'measurement', 'order'))
+    create_index(conn, client, 'ix_client_created_at_id')
+    create_index(conn, client, 'ix_client_updated_at')
+    create_index(conn, measurement, 'ix_measurement_client_id_created_at')
+    create_index(conn, measurement, 'ix_measurement_updated_at')
+    create_index(conn, measurement, 'ix_measurement_image_path')
+    create_index(conn, order, 'ix_order_status_created_at')
+    create_index(conn, order, 'ix_order_client_id')
+    create_index(conn, order, 'ix_order_updated_at')
+
+# Frozen copies of app.BODY_DIMENSIONS and app.parse_dimension as of migration
+# 0002: later edits to the app must not change what this migration writes
+MIGRATION_0002_DIMENSIONS = [
+    'do', 'poitrine', 'taille', 'longueur', 'manche', 'tour_manche', 'ceinture',
+    'bassin', 'cuisse', 'longueur_pantalon', 'bas', 'longueur_genou', 'tour_mollet'
+]
+MIGRATION_0002_NUMBER = re.compile(r'\d+(?:[.,]\d+)?')
+
+def migration_0002_numeric_values(row):
+    """<dim>_min/<dim>_max values of a measurement row, (None, None) when a dimension has no number"""
+    values = {}
+    for dimension in MIGRATION_0002_DIMENSIONS:
+        text = getattr(row, dimension)
+        numbers = [float(n.replace(',', '.')) for n in MIGRATION_0002_NUMBER.findall(str(text or ''))]
+        values[f'{dimension}_min'] = min(numbers) if numbers else None
+        values[f'{dimension}_max'] = max(numbers) if numbers else None
+    return values
+
+def migration_0002_numeric_measurements(conn, metadata):
+    """Numeric <dim>_min/<dim>_max columns on measurement, filled here from the text values"""
+    measurement = metadata.tables['measurement']
+    numeric_columns = [f'{d}_{bound}' for d in MIGRATION_0002_DIMENSIONS for bound in ('min', 'max')]
+    for name in numeric_columns:
+        add_column(conn, measurement, name)
+
+    columns = [measurement.c.id] + [measurement.c[d] for d in MIGRATION_0002_DIMENSIONS]
+    fill = measurement.update().where(measurement.c.id == bindparam('measurement_id')).values(
+        # Filling derived columns is not a change clients need to sync again
+        updated_at=measurement.c.updated_at,
+        **{name: bindparam(name) for name in numeric_columns}
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(*columns).where(measurement.c.id > last_id).order_by(measurement.c.id).limit(1000)
+        ).all()
+        if not rows:
+            break
+        conn.execute(fill, [
+            {'measurement_id': row.id, **migration_0002_numeric_values(row)} for row in rows
+        ])
+        last_id = rows[-1].id
+
+    create_index(conn, measurement, 'ix_measurement_poitrine_range')
+    create_index(conn, measurement, 'ix_measurement_taille_range')
+    create_index(conn, measurement, 'ix_measurement_bassin_range')
+
+def migration_0003_cache_versions(conn, metadata):
+    """One cache_version row per cached table, bumped on every committed write"""
+    cache_version = metadata.tables['cache_version']
+    existing = {row[0] for row in conn.execute(cache_version.select().with_only_columns(cache_version.c.table_name))}
+    for name in ('client', 'measurement', 'order'):
+        if name not in existing:
+            conn.execute(cache_version.insert().values(table_name=name, version=0))
+
+def migration_0004_client_search(conn, metadata):
+    """client.search_text/phone_digits, filled here, and their trigram indexes on PostgreSQL"""
+    from client_search import search_text, phone_digits
+    client = metadata.tables['client']
+    add_column(conn, client, 'search_text')
+    add_column(conn, client, 'phone_digits')
+
+    rows = conn.execute(client.select().with_only_columns(
+        client.c.id, client.c.nom, client.c.prenoms, client.c.email, client.c.telephone
+    ).where(client.c.search_text.is_(None))).all()
+    values = [
+        {'client_id': row.id, 'search_text': search_text(row.nom, row.prenoms, row.email),
+         'phone_digits': phone_digits(row.telephone)}
+        for row in rows
+    ]
+    if values:
+        conn.execute(
+            client.update().where(client.c.id == bindparam('client_id')).values(
+                # Keep updated_at: derived columns are not a change to sync
+                updated_at=client.c.updated_at,
+                search_text=bindparam('search_text'), phone_digits=bindparam('phone_digits')
+            ),
+            values
+        )
+
+    if conn.dialect.name != 'postgresql':
+        return
+    try:
+        # Needs CREATE privilege on the database; without it search falls back to the in-process index
+        with conn.begin_nested():
+            conn.exec_driver_sql('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except Exception as e:
+        print(f"⚠️  pg_trgm unavailable, client search will use the in-process index: {e}")
+        return
+    conn.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_client_search_text_trgm ON client USING gin (search_text gin_trgm_ops)'
+    )
+    conn.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_client_phone_digits_trgm ON client USING gin (phone_digits gin_trgm_ops)'
+    )
+
+def migration_0005_client_balances(conn, metadata):
+    """One client_balance row per client, aggregated from its orders"""
+    client, order, client_balance = (metadata.tables[name] for name in ('client', 'order', 'client_balance'))
+    totals = {
+        row.client_id: row for row in conn.execute(select(
+            order.c.client_id,
+            func.count().label('order_count'),
+            func.count().filter(order.c.status != 'termine').label('open_orders'),
+            func.coalesce(func.sum(order.c.montant_total), 0).label('total_amount'),
+            func.coalesce(func.sum(order.c.montant_avance), 0).label('total_paid'),
+            func.coalesce(func.sum(order.c.montant_restant), 0).label('balance'),
+            func.max(order.c.created_at).label('last_order_at')
+        ).group_by(order.c.client_id))
+    }
+    existing = {row[0] for row in conn.execute(select(client_balance.c.client_id))}
+    now = datetime.utcnow()
+    rows = []
+    for (client_id,) in conn.execute(select(client.c.id)):
+        if client_id in existing:
+            continue
+        total = totals.get(client_id)
+        rows.append({
+            'client_id': client_id,
+            'order_count': total.order_count if total else 0,
+            'open_orders': total.open_orders if total else 0,
+            'total_amount': float(total.total_amount) if total else 0.0,
+            'total_paid': float(total.total_paid) if total else 0.0,
+            'balance': float(total.balance) if total else 0.0,
+            'last_order_at': total.last_order_at if total else None,
+            'updated_at': now
+        })
+    if rows:
+        conn.execute(client_balance.insert(), rows)
+
+    cache_version = metadata.tables['cache_version']
+    if conn.execute(select(cache_version.c.table_name).where(cache_version.c.table_name == 'client_balance')).first() is None:
+        conn.execute(cache_version.insert().values(table_name='client_balance', version=0))
+
+def migration_0006_order_rollups(conn, metadata):
+    """One order_rollup row per day with orders created or completed"""
+    order, order_rollup = metadata.tables['order'], metadata.tables['order_rollup']
+    if conn.execute(select(order_rollup.c.day).limit(1)).first() is None:
+        rollups = {}
+        created_day = func.date(order.c.created_at, type_=Date)
+        completed_day = func.date(order.c.completed_at, type_=Date)
+        for row in conn.execute(select(
+            created_day.label('day'),
+            func.count().label('orders'),
+            func.coalesce(func.sum(order.c.montant_total), 0).label('revenue'),
+            func.coalesce(func.sum(order.c.montant_avance), 0).label('advances'),
+            func.coalesce(func.sum(order.c.montant_restant), 0).label('outstanding')
+        ).where(order.c.created_at.isnot(None)).group_by(created_day)):
+            rollups[row.day] = {
+                'day': row.day, 'orders': row.orders, 'revenue': float(row.revenue),
+                'advances': float(row.advances), 'outstanding': float(row.outstanding),
+                'completed_orders': 0, 'completed_revenue': 0.0
+            }
+        for row in conn.execute(select(
+            completed_day.label('day'),
+            func.count().label('completed_orders'),
+            func.coalesce(func.sum(order.c.montant_total), 0).label('completed_revenue')
+        ).where(order.c.completed_at.isnot(None)).group_by(completed_day)):
+            rollup = rollups.setdefault(row.day, {
+                'day': row.day, 'orders': 0, 'revenue': 0.0, 'advances': 0.0, 'outstanding': 0.0
+            })
+            rollup.update(completed_orders=row.completed_orders, completed_revenue=float(row.completed_revenue))
+        if rollups:
+            conn.execute(order_rollup.insert(), list(rollups.values()))
+
+    cache_version = metadata.tables['cache_version']
+    if conn.execute(select(cache_version.c.table_name).where(cache_version.c.table_name == 'order_rollup')).first() is None:
+        conn.execute(cache_version.insert().values(table_name='order_rollup', version=0))
+
+def migration_0007_client_external_ref(conn, metadata):
+    """client.external_ref, the key of imported clients, with its unique index"""
+    client = metadata.tables['client']
+    add_column(conn, client, 'external_ref')
+    create_index(conn, client, 'ix_client_external_ref')
+
+# Append new migrations at the end, never reorder or rename applied ones
+MIGRATIONS = [
+    ('0001_hot_query_indexes', migration_0001_hot_query_indexes),
+    ('0002_numeric_measurements', migration_0002_numeric_measurements),
+    ('0003_cache_versions', migration_0003_cache_versions),
+    ('0004_client_search', migration_0004_client_search),
+    ('0005_client_balances', migration_0005_client_balances),
+    ('0006_order_rollups', migration_0006_order_rollups),
+    ('0007_client_external_ref', migration_0007_client_external_ref),
+]
+
+def run_migrations(engine, metadata):
+    """Apply pending migrations, each in its own transaction. Returns the versions applied."""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        applied = {row[0] for row in conn.execute(schema_migrations.select().with_only_columns(schema_migrations.c.version))}
+
+    newly_applied = []
+    for version, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        print(f"🔧 Applying migration {version}...")
+        with engine.begin() as conn:
+            migrate(conn, metadata)
+            conn.execute(schema_migrations.insert().values(version=version, applied_at=datetime.utcnow()))
+        newly_applied.append(version)
+    if newly_applied:
+        print(f"✅ Applied migrations: {newly_applied}")
+    return newly_applied
+
+if __name__ == '__main__':
+    from app import app, db
+    with app.app_context():
+        run_migrations(db.engine, db.metadata)
+    sys.exit(0)
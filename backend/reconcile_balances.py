@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Script de réconciliation des soldes clients
+
+Recalcule le résumé de chaque client (nombre de commandes, commandes en cours,
+totaux, reste à payer, date de la dernière commande) depuis la table des
+commandes, affiche les écarts avec client_balance puis la reconstruit.
+Fait de même pour les totaux par jour de order_rollup (/api/stats/timeseries).
+Avec --dry-run, les écarts sont seulement affichés.
+"""
+import sys
+from app import (
+    app, db, Client, ClientBalance, OrderRollup, ROLLUP_FIELDS,
+    compute_client_balances, compute_order_rollups, empty_balance
+)
+
+# Float sums accumulated over many updates may differ by rounding only
+AMOUNT_TOLERANCE = 0.005
+AMOUNT_FIELDS = ('total_amount', 'total_paid', 'balance')
+COUNT_FIELDS = ('order_count', 'open_orders', 'last_order_at')
+
+def reconcile(dry_run=False):
+    """Report drift between client_balance and the orders, then rebuild the rows that drifted"""
+    with app.app_context():
+        expected = compute_client_balances()
+        stored = {row.client_id: row for row in ClientBalance.query}
+        client_ids = [row[0] for row in db.session.query(Client.id)]
+
+        drifted = []
+        for client_id in client_ids:
+            want = expected.get(client_id, empty_balance(client_id))
+            have = stored.get(client_id)
+            if have is None:
+                print(f"Client {client_id}: missing summary")
+                drifted.append(want)
+                continue
+            differences = [
+                f"{field} {getattr(have, field)} -> {want[field]}" for field in AMOUNT_FIELDS
+                if abs((getattr(have, field) or 0) - want[field]) > AMOUNT_TOLERANCE
+            ] + [
+                f"{field} {getattr(have, field)} -> {want[field]}" for field in COUNT_FIELDS
+                if getattr(have, field) != want[field]
+            ]
+            if differences:
+                print(f"Client {client_id}: {', '.join(differences)}")
+                drifted.append(want)
+        orphans = set(stored) - set(client_ids)
+
+        if dry_run:
+            print(f"✅ {len(drifted)} client(s) with drift, {len(orphans)} orphan summary(ies) (dry run)")
+            return len(drifted) + len(orphans)
+
+        if orphans:
+            ClientBalance.query.filter(ClientBalance.client_id.in_(orphans)).delete(synchronize_session=False)
+        for values in drifted:
+            db.session.merge(ClientBalance(**values))
+        db.session.commit()
+        print(f"✅ {len(drifted)} client summary(ies) rebuilt, {len(orphans)} orphan(s) removed")
+        return len(drifted) + len(orphans)
+
+def reconcile_rollups(dry_run=False):
+    """Report drift between order_rollup and the orders, then rebuild the days that drifted"""
+    with app.app_context():
+        expected = compute_order_rollups()
+        stored = {row.day: row for row in OrderRollup.query}
+
+        drifted = []
+        for day in sorted(set(expected) | set(stored)):
+            want = expected.get(day, dict(dict.fromkeys(ROLLUP_FIELDS, 0), day=day))
+            have = stored.get(day)
+            differences = [
+                f"{field} {getattr(have, field) if have else None} -> {want[field]}" for field in ROLLUP_FIELDS
+                if have is None or abs(getattr(have, field) - want[field]) > AMOUNT_TOLERANCE
+            ]
+            # A day whose orders are all gone may keep its zero row
+            if differences and (have is not None or any(want[field] for field in ROLLUP_FIELDS)):
+                print(f"Day {day}: {', '.join(differences)}")
+                drifted.append(want)
+
+        if dry_run:
+            print(f"✅ {len(drifted)} day(s) with drift (dry run)")
+            return len(drifted)
+
+        for values in drifted:
+            db.session.merge(OrderRollup(**values))
+        db.session.commit()
+        print(f"✅ {len(drifted)} day(s) rebuilt")
+        return len(drifted)
+
+if __name__ == '__main__':
+    dry_run = '--dry-run' in sys.argv
+    print("🔧 Reconciling client balances...")
+    reconcile(dry_run=dry_run)
+    print("🔧 Reconciling daily order totals...")
+    reconcile_rollups(dry_run=dry_run)
+    sys.exit(0)
@@ -0,0 +1,99 @@
+"""
+Cache of serialized JSON responses for the read-heavy list endpoints.
+
+Each entry remembers the version of every table its response was built from.
+A write bumps the versions of the tables it touched, so the next lookup sees a
+different version and rebuilds the response. The caller decides how fresh the
+versions it passes are: writes of this process are seen at once, those of other
+processes once their versions are read back from the database. Entries are
+evicted least recently used first once the cache holds more than max_bytes of
+response bodies.
+"""
+import threading
+from collections import OrderedDict
+
+class TableVersions:
+    """Per-table write counters kept in this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions = {}
+
+    def current(self, tables):
+        with self.lock:
+            return tuple(self.versions.get(table, 0) for table in tables)
+
+    def bump(self, tables):
+        with self.lock:
+            for table in tables:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+class ResponseCache:
+    """LRU of (versions, body, mimetype, etag) keyed by (endpoint, path, query string)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.endpoints = {}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _count(self, endpoint, outcome):
+        counters = self.endpoints.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+    def _drop(self, key):
+        _, body, _, _ = self.entries.pop(key)
+        self.size -= len(body)
+
+    def get(self, key, versions):
+        """Return (body, mimetype, etag) if cached for exactly these versions"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] != versions:
+                # Built from older data, it can never be served again
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self._count(key[0], 'misses')
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self._count(key[0], 'hits')
+            return entry[1:]
+
+    def put(self, key, versions, body, mimetype, etag=None):
+        # One huge response must not flush everything else out
+        if len(body) > self.max_bytes // 4:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (versions, body, mimetype, etag)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def snapshot(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+                'evictions': self.evictions,
+                'endpoints': {name: dict(counters) for name, counters in self.endpoints.items()}
+            }
@@ -0,0 +1,127 @@
+"""
+Index en mémoire des mesures pour la recherche de morphologies proches
+
+Chaque mesure est un vecteur de ses dimensions corporelles (valeur centrale de
+"90-95" = 92.5, NaN si non renseignée). Les k plus proches voisins sont
+calculés par quelques produits matrice-vecteur NumPy sur toute la matrice.
+"""
+import threading
+import numpy as np
+
+# Two measurements are only compared if they share at least this many dimensions
+MIN_SHARED_DIMENSIONS = 3
+
+class MeasurementIndex:
+    """
+    Growable matrix of measurement vectors with O(1) upsert and delete.
+
+    Missing dimensions are stored as 0 in `filled` with a 0/1 `mask`, so the
+    squared distance over shared dimensions expands into matrix-vector products:
+    sum(mask*q_mask*(x - q)^2) = squares@q_mask - 2*filled@(q_mask*q) + mask@(q_mask*q^2)
+    """
+
+    def __init__(self, dimensions, capacity=1024):
+        self.dimensions = list(dimensions)
+        width = len(self.dimensions)
+        self.filled = np.zeros((capacity, width), dtype=np.float32)
+        self.squares = np.zeros((capacity, width), dtype=np.float32)
+        self.mask = np.zeros((capacity, width), dtype=np.float32)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.client_ids = np.zeros(capacity, dtype=np.int64)
+        self.positions = {}
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        capacity = len(self.ids) * 2
+        for name in ('filled', 'squares', 'mask'):
+            current = getattr(self, name)
+            grown = np.zeros((capacity, current.shape[1]), dtype=np.float32)
+            grown[:self.size] = current[:self.size]
+            setattr(self, name, grown)
+        self.ids = np.resize(self.ids, capacity)
+        self.client_ids = np.resize(self.client_ids, capacity)
+
+    def _copy_row(self, source, target):
+        for array in (self.filled, self.squares, self.mask, self.ids, self.client_ids):
+            array[target] = array[source]
+
+    def upsert(self, id, client_id, vector):
+        """Insert or replace the vector of a measurement (NaN for missing dimensions)"""
+        vector = np.asarray(vector, dtype=np.float32)
+        known = ~np.isnan(vector)
+        filled = np.where(known, vector, 0)
+        with self.lock:
+            position = self.positions.get(id)
+            if position is None:
+                if self.size == len(self.ids):
+                    self._grow()
+                position = self.size
+                self.positions[id] = position
+                self.size += 1
+            self.ids[position] = id
+            self.client_ids[position] = client_id
+            self.filled[position] = filled
+            self.squares[position] = filled * filled
+            self.mask[position] = known
+
+    def remove(self, id):
+        """Delete a measurement by moving the last row into its slot"""
+        with self.lock:
+            position = self.positions.pop(id, None)
+            if position is None:
+                return
+            last = self.size - 1
+            if position != last:
+                self._copy_row(last, position)
+                self.positions[int(self.ids[position])] = position
+            self.size = last
+
+    def vector(self, id):
+        with self.lock:
+            position = self.positions.get(id)
+            if position is None:
+                return None
+            return np.where(self.mask[position] > 0, self.filled[position], np.nan).astype(np.float32)
+
+    def nearest(self, vector, k=10, exclude_client_id=None, exclude_id=None):
+        """
+        k nearest measurements as [(id, distance)], closest first.
+        The distance is the RMS difference over the dimensions both vectors have.
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        query_mask = (~np.isnan(vector)).astype(np.float32)
+        known = int(query_mask.sum())
+        if known == 0:
+            return []
+        query = np.where(query_mask > 0, vector, 0).astype(np.float32)
+
+        with self.lock:
+            size = self.size
+            ids = self.ids[:size]
+            client_ids = self.client_ids[:size]
+            mask = self.mask[:size]
+
+            shared_count = mask @ query_mask
+            squared = self.squares[:size] @ query_mask
+            squared -= 2 * (self.filled[:size] @ query)
+            squared += mask @ (query * query)
+            # float32 cancellation can leave tiny negatives for identical vectors
+            np.maximum(squared, 0, out=squared)
+            distances = np.sqrt(squared / np.maximum(shared_count, 1))
+
+            distances[shared_count < min(MIN_SHARED_DIMENSIONS, known)] = np.inf
+            if exclude_id is not None:
+                distances[ids == exclude_id] = np.inf
+            if exclude_client_id is not None:
+                distances[client_ids == exclude_client_id] = np.inf
+
+            k = min(k, size)
+            if k <= 0:
+                return []
+            candidates = np.argpartition(distances, k - 1)[:k]
+            candidates = candidates[np.argsort(distances[candidates])]
+            return [(int(ids[i]), float(distances[i])) for i in candidates if np.isfinite(distances[i])]
@@ -0,0 +1,28 @@
+"""
+Shared test setup: every test module gets a freshly created and migrated
+SQLite database in a temporary directory, dropped once the module is done.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+DB_DIR = tempfile.mkdtemp(prefix='kis-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'test.db')}"
+# Cached responses would skip the queries and writes under test
+os.environ['RESPONSE_CACHE_MAX_BYTES'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db, init_database_tables
+
+@pytest.fixture(scope='module')
+def database():
+    with app.app_context():
+        init_database_tables()
+    yield db
+    with app.app_context():
+        db.drop_all()
+        # Not a model table: dropping it lets the next module run the migrations again
+        db.session.execute(db.text('DROP TABLE IF EXISTS schema_migrations'))
+        db.session.commit()
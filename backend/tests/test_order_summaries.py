@@ -0,0 +1,100 @@
+"""
+client_balance and order_rollup are maintained incrementally by every order
+write (OrderChanges); after any mix of writes reconcile_balances.py must find
+nothing to fix. Dates sent with an offset are stored as naive UTC, like the rest.
+"""
+import json
+from datetime import datetime
+
+import pytest
+from app import app, db, Order
+from reconcile_balances import reconcile, reconcile_rollups
+
+@pytest.fixture
+def client(database):
+    return app.test_client()
+
+def assert_no_drift():
+    assert reconcile(dry_run=True) == 0
+    assert reconcile_rollups(dry_run=True) == 0
+
+def new_client(client, nom='Kouassi'):
+    response = client.post('/api/clients', json={'nom': nom, 'prenoms': 'Awa', 'telephone': '0700000000'})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def new_order(client, client_id, total, paid=0):
+    response = client.post('/api/orders', json={'client_id': client_id, 'montant_total': total, 'montant_avance': paid})
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def stored_created_at(order_id):
+    with app.app_context():
+        return db.session.get(Order, order_id).created_at
+
+def test_order_endpoints_keep_summaries(client):
+    client_id = new_client(client)
+    first = new_order(client, client_id, 100, 20)
+    second = new_order(client, client_id, 50, 50)
+    third = new_order(client, client_id, 80)
+    assert_no_drift()
+
+    assert client.put(f'/api/orders/{first}', json={'montant_avance': 100}).status_code == 200
+    assert client.put(f'/api/orders/{second}', json={'montant_total': 70}).status_code == 200
+    assert client.delete(f'/api/orders/{third}').status_code == 200
+    assert_no_drift()
+
+def test_delete_client_keeps_summaries(client):
+    kept = new_client(client, 'Konan')
+    deleted = new_client(client, 'Yao')
+    new_order(client, kept, 40, 10)
+    new_order(client, deleted, 60, 10)
+    new_order(client, deleted, 30, 30)
+    assert client.delete(f'/api/clients/{deleted}').status_code == 200
+    assert_no_drift()
+
+def test_sync_mixes_aware_and_naive_dates(client):
+    client_id = new_client(client, 'Traoré')
+    existing = new_order(client, client_id, 100, 10)
+    response = client.post('/api/sync', json={'orders': [
+        {'id': str(existing), 'client_id': client_id, 'montant_total': 120, 'montant_avance': 30},
+        {'id': 'temp_1', 'client_id': client_id, 'montant_total': 50, 'montant_avance': 0,
+         'created_at': '2025-03-01T10:00:00.000Z'},
+        {'id': 'temp_2', 'client_id': client_id, 'montant_total': 70, 'montant_avance': 70,
+         'created_at': '2025-03-01T23:30:00-02:00', 'status': 'termine',
+         'completed_at': '2025-03-02T09:00:00+01:00'},
+        {'id': 'temp_3', 'client_id': client_id, 'montant_total': 20, 'montant_avance': 5},
+    ]})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json()['success']
+
+    with app.app_context():
+        synced = {
+            order.montant_total: order for order in
+            Order.query.filter(Order.client_id == client_id, Order.montant_total.in_([50, 70]))
+        }
+    assert synced[50].created_at == datetime(2025, 3, 1, 10, 0)
+    # Booked on the UTC day, not the day of the sender's offset
+    assert synced[70].created_at == datetime(2025, 3, 2, 1, 30)
+    assert synced[70].completed_at == datetime(2025, 3, 2, 8, 0)
+    assert_no_drift()
+
+def test_import_mixes_aware_and_naive_dates(client):
+    client_id = new_client(client, 'Bamba')
+    new_order(client, client_id, 10)
+    records = [
+        {'client_id': client_id, 'montant_total': 90, 'montant_avance': 10, 'created_at': '2025-04-01T08:00:00Z'},
+        {'client_id': client_id, 'montant_total': 40, 'montant_avance': 0, 'created_at': '2025-04-01T08:00:00'},
+        {'client_id': client_id, 'montant_total': 25, 'montant_avance': 25, 'created_at': '2025-04-01T01:00:00+03:00'},
+        {'client_id': client_id, 'montant_total': 15, 'montant_avance': 0},
+    ]
+    response = client.post('/api/import/orders', data='\n'.join(json.dumps(r) for r in records),
+                           content_type='application/x-ndjson')
+    assert response.status_code == 200, response.get_data(as_text=True)
+    report = response.get_json()
+    assert (report['imported'], report['failed']) == (4, 0)
+
+    with app.app_context():
+        early = Order.query.filter(Order.client_id == client_id, Order.montant_total == 25).one()
+    assert early.created_at == datetime(2025, 3, 31, 22, 0)
+    assert_no_drift()
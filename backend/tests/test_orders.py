@@ -0,0 +1,61 @@
+"""
+Order endpoints must issue a constant number of SQL statements, whatever the
+number of orders: each order's client is loaded in the same SELECT.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+from app import app, db, Client, Order
+
+N_ORDERS = 1000
+
+@pytest.fixture(scope='module')
+def client(database):
+    with app.app_context():
+        start = datetime(2025, 1, 1)
+        db.session.execute(insert(Client), [
+            {'nom': f'Nom{i}', 'prenoms': 'Prénoms', 'telephone': f'07{i:08d}'} for i in range(N_ORDERS // 10)
+        ])
+        db.session.execute(insert(Order), [
+            {'client_id': i % (N_ORDERS // 10) + 1, 'montant_total': 100.0, 'montant_avance': 20.0,
+             'montant_restant': 80.0, 'status': 'en_cours', 'created_at': start + timedelta(minutes=i)}
+            for i in range(N_ORDERS)
+        ])
+        db.session.commit()
+    yield app.test_client()
+
+def count_statements(client, url):
+    """(response, number of statements sent to the database while serving url)"""
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return response, len(statements)
+
+def test_order_list_statement_count(client):
+    response, statements = count_statements(client, '/api/orders')
+    assert response.status_code == 200
+    orders = response.get_json()
+    assert len(orders) == N_ORDERS
+    assert all(order['client']['id'] == order['client_id'] for order in orders)
+    # ETag aggregate + the orders joined with their clients
+    assert statements == 2
+
+def test_order_list_statement_count_with_filter(client):
+    response, statements = count_statements(client, '/api/orders?status=en_cours')
+    assert len(response.get_json()) == N_ORDERS
+    assert statements == 2
+
+def test_order_detail_statement_count(client):
+    response, statements = count_statements(client, f'/api/orders/{N_ORDERS}')
+    assert response.status_code == 200
+    assert response.get_json()['client']['id'] == response.get_json()['client_id']
+    # ETag aggregate + the order joined with its client
+    assert statements == 2